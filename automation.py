@@ -1,115 +1,556 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from contextlib import contextmanager, nullcontext
+from functools import partial
+
 import pdfplumber
 import re
 
+from result_cache import ResultCache
+
+# Bump whenever extraction output changes so stale cache entries are ignored
+EXTRACTOR_VERSION = "3"
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".akhtar_po_cache")
+
+CANCEL_CHECK_INTERVAL = 0.2  # seconds between cancel checks while waiting on workers
+
+
+DATE_RE = re.compile(r'\d{2}\.\d{2}\.\d{4}')
+ITEM_NUMBER_RE = re.compile(r'\d{5}')
+ADDRESS_RE = re.compile(r'(.*?)\s*(\d+)')
+COMPANY_RE = re.compile(r'Company.*?(?=Sourcing|-)', re.DOTALL)
+
 
 def is_date_format(text):
     """Check if text matches DD.MM.YYYY format"""
-    return bool(re.match(r'^\d{2}\.\d{2}\.\d{4}$', text))
+    return DATE_RE.fullmatch(text) is not None
 
 def parse_address_text(text):
     """Parse text to separate text before number and the number"""
-    import re
-    
     # Find the first number in the text
-    match = re.search(r'(.*?)\s*(\d+)', text)
+    match = ADDRESS_RE.search(text)
     if match:
         text_part = match.group(1).strip()  # Text before number
         number_part = match.group(2)  # The number
         return text_part, number_part
     return text, None
 
-def extract_po_data(pdf_path):
-    fields = {
-        "PO Number": None,
-        "Style Number": None,
-        "Description": None,
-        "PO Rel Date": None,
-        "Unit Price": None,
-        "PO Qty": None,
-        "HOD Date": None,
-        "FFC Code": None,
-        "Seller": None,
-        "Sourcing Type": None,
-        "PO Header Text": None,
-        "Country": None,
-        "VAS": None,
-        "Plant Code": None,
-        "Season": None,
-        "Brand": None
-    }
+class ExtractionStats:
+    """Seconds spent in each extraction stage, summed over the documents it was passed to.
 
-    with pdfplumber.open(pdf_path) as pdf:
-        text = "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
+    Stages: "open" (open the PDF and read its page tree), "pdfminer" (parse
+    page content into characters), "layout" (turn characters into text),
+    "join" (concatenate page text) and "parse" (field parsing).
+    """
+
+    STAGES = ("open", "pdfminer", "layout", "join", "parse")
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(self.STAGES, 0.0)
+        self.documents = 0
+        self.pages = 0
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+    @property
+    def total(self):
+        return sum(self.seconds.values())
+
+    def merge(self, other):
+        for name, seconds in other.seconds.items():
+            self.seconds[name] += seconds
+        self.documents += other.documents
+        self.pages += other.pages
+
+    def as_dict(self):
+        return {"documents": self.documents, "pages": self.pages, "seconds": dict(self.seconds), "total": self.total}
+
+def _stage(stats, name):
+    """Time a stage into stats, or do nothing when no stats are being collected"""
+    return stats.stage(name) if stats is not None else nullcontext()
 
-    # Extract company to sourcing type text
-    company_to_sourcing = re.search(r'Company.*?(?=Sourcing|-)', text, re.DOTALL)
-    company_text = company_to_sourcing.group(0) if company_to_sourcing else ""
+def _load_page(page, stats):
+    """Run pdfminer over a page up front so its cost is timed apart from layout"""
+    if stats is not None:
+        with stats.stage("pdfminer"):
+            page.chars
+        stats.pages += 1
 
-    # Determine seller based on text content
-    if 'arka' in company_text.lower():
-        seller = "Arka Global"
-    elif 'akhtar' in company_text.lower():
-        seller = "Akhtar Textile Industries Pvt Ltd"
+def release_page(page):
+    """Drop a page's cached layout objects so memory stays flat on long POs"""
+    close = getattr(page, "close", None)
+    if close is not None:
+        close()
     else:
-        seller = None
-
-
-    # Regex patterns for each field
-    splitted_text= text.split('Item Total Value')[1]
-    country = splitted_text.split('Line Item')[0].split()[-1].split(",")[-1].strip()
-    Description_2 = splitted_text.split('Line Item')[0]
-    splitted_text = splitted_text.split('Date')[1].split('\n')[1].strip()
-    
-    description_text = splitted_text.split('Line Item')[0]
-    splitted_text = splitted_text.split()
-    
-    fields["HOD Date"] = next(date for date in splitted_text if is_date_format(date))
-
-    Description_1 = description_text.split(splitted_text[1])[1]
-    Description_1 = Description_1.split(fields["HOD Date"])[0].strip()
-    Description_2 = Description_2.split(splitted_text[-1])[1].strip().split("\n")[0].strip()
-    Description_2, number = parse_address_text(Description_2)
-
-    Description = f"{Description_1} {Description_2}".strip()
-
-    Qty = splitted_text[-4]
-    UnitPrice = splitted_text[-2]
-
-    Description_1 = description_text.split(description_text.split()[1])[1]
-    Description_1 = Description_1.split(fields["HOD Date"])
-
-    fields["Plant Code"] = splitted_text[splitted_text.index(next(date for date in splitted_text if is_date_format(date))) + 2]
-    fields["Style Number"] = splitted_text[1]    
-    fields["Description"] = Description    
-    
-    patterns = {
-        "PO Number": r"Purchase Order#\s*(\d+)",
-        "PO Header Text": r"PO Header Text\s*-\s*(.*?)(?=Purchase Order Item Details)",
-        "FFC Code": r"FFC Code\s*([A-Z0-9]+)",
-        "Country": r"Manufacturing Country of Origin.*",
-        "Sourcing Type": r"Sourcing Type\s*-\s*([^\n]+)",
-        "VAS": r"Line Item VAS\s*Line Item Text\n([\s\S]+?)\nItem#",
-        "Season": r"Season\s*([\w\d]+)",
-        "Brand": r"Brand\s*([\w\d]+)",
-        "PO Rel Date": r"PO Rel Date\s*(\d{2}\.\d{2}\.\d{4})"
-    }
-
-
-    for key, pattern in patterns.items():
-        match = re.search(pattern, text, re.IGNORECASE)
+        page.flush_cache()
+
+def iter_page_text(pdf, stats=None, regions=False):
+    """Yield the text of each non-empty page, running layout analysis once per page.
+
+    With regions=True only the anchored PO bands of each page are laid out
+    (see region_text).
+    """
+    for page in pdf.pages:
+        try:
+            _load_page(page, stats)
+            with _stage(stats, "layout"):
+                text = region_text(page) if regions else page.extract_text()
+        finally:
+            release_page(page)
+        if text:
+            yield text
+
+def _open_pdf(pdf_path, stats):
+    with _stage(stats, "open"):
+        pdf = pdfplumber.open(pdf_path)
+        try:
+            pdf.pages  # reads the page tree
+        except Exception:
+            pdf.close()
+            raise
+    return pdf
+
+def extract_text(pdf_path, stats=None):
+    """Return the text of all pages of a PDF joined by newlines"""
+    with _open_pdf(pdf_path, stats) as pdf:
+        texts = list(iter_page_text(pdf, stats))
+    with _stage(stats, "join"):
+        return "\n".join(texts)
+
+FIELD_NAMES = [
+    "PO Number",
+    "Style Number",
+    "Description",
+    "PO Rel Date",
+    "Unit Price",
+    "PO Qty",
+    "HOD Date",
+    "FFC Code",
+    "Seller",
+    "Sourcing Type",
+    "PO Header Text",
+    "Country",
+    "VAS",
+    "Plant Code",
+    "Season",
+    "Brand"
+]
+
+# Header fields: compiled pattern whose first group is the value, searched in the
+# text above the item table. Add a field here (and to FIELD_NAMES) to extract it.
+HEADER_PATTERNS = {
+    "PO Number": re.compile(r"Purchase Order#\s*(\d+)", re.IGNORECASE),
+    "PO Header Text": re.compile(r"PO Header Text\s*-\s*(.*?)(?=Purchase Order Item Details)", re.IGNORECASE),
+    "FFC Code": re.compile(r"FFC Code\s*([A-Z0-9]+)", re.IGNORECASE),
+    "Sourcing Type": re.compile(r"Sourcing Type\s*-\s*([^\n]+)", re.IGNORECASE),
+    "Season": re.compile(r"Season\s*([\w\d]+)", re.IGNORECASE),
+    "Brand": re.compile(r"Brand\s*([\w\d]+)", re.IGNORECASE),
+    "PO Rel Date": re.compile(r"PO Rel Date\s*(\d{2}\.\d{2}\.\d{4})", re.IGNORECASE)
+}
+
+# Fields shared by every line item of a PO, read from the page header
+HEADER_FIELDS = list(HEADER_PATTERNS) + ["Seller"]
+
+# Item Details row fields as (anchor, offset) into the row's tokens: "start" is
+# the first token, "date" the first DD.MM.YYYY token (HOD date), "end" one past the last
+ITEM_ROW_FIELDS = {
+    "Line Item": ("start", 0),
+    "Style Number": ("start", 1),
+    "HOD Date": ("date", 0),
+    "Plant Code": ("date", 2),
+    "PO Qty": ("end", -4),
+    "Unit Price": ("end", -2),
+}
+
+# Lines that open each section of the PO text
+ITEM_TABLE_MARKER = "Item Total Value"
+VAS_MARKER = "Line Item VAS"
+VARIANT_TABLE_MARKER = "Item#"
+# Running page footer; everything from it to the end of a page is boilerplate
+PAGE_FOOTER = "This Purchase Order is"
+# First and last lines of the header repeated at the top of every page
+PAGE_HEADER_START = "Purchase Order#"
+PAGE_HEADER_END = "Purchase Order PO Value"
+
+# Page bands holding PO fields as (start phrase, end phrase, include end line)
+REGION_ANCHORS = [
+    ("Purchase Order#", "Purchase Order Item Details", True),   # header incl. Company…Sourcing and PO Header Text
+    ("Item Total Value", "Line Item VAS", False),               # line item table
+    ("Line Item VAS", "Item#", True),                           # VAS block up to the variant table
+]
+
+def _find_phrase(words, phrase, below=None):
+    """Return (top, bottom) of the first line holding phrase as consecutive words"""
+    tokens = phrase.split()
+    for i in range(len(words) - len(tokens) + 1):
+        first = words[i]
+        if below is not None and first["top"] <= below:
+            continue
+        if all(words[i + j]["text"] == token and abs(words[i + j]["top"] - first["top"]) < 2
+               for j, token in enumerate(tokens)):
+            return first["top"], max(words[i + j]["bottom"] for j in range(len(tokens)))
+    return None
+
+def region_text(page):
+    """Lay out only the anchored PO bands of a page, or the full page if no anchor is found"""
+    words = page.extract_words()
+    texts = []
+    for start_phrase, end_phrase, include_end in REGION_ANCHORS:
+        start = _find_phrase(words, start_phrase)
+        if start is None:
+            continue
+        end = _find_phrase(words, end_phrase, below=start[0])
+        if end is None:
+            bottom = page.bbox[3]
+        else:
+            bottom = end[1] + 1 if include_end else end[0] - 1
+        band = page.within_bbox((page.bbox[0], start[0] - 1, page.bbox[2], bottom))
+        text = band.extract_text()
+        if text:
+            texts.append(text)
+    if not texts:
+        return page.extract_text()
+    return "\n".join(texts)
+
+def extract_po_data(pdf_path, regions=False, stats=None):
+    """Extract PO fields from a PDF.
+
+    With regions=True only the anchored field bands are laid out and pages
+    stop being read once the first line item is complete. Pass an
+    ExtractionStats as stats to collect per-stage timings.
+    """
+    if stats is not None:
+        stats.documents += 1
+    if not regions:
+        text = extract_text(pdf_path, stats)
+        with _stage(stats, "parse"):
+            return parse_po_text(text)
+
+    with _open_pdf(pdf_path, stats) as pdf:
+        # Pages are laid out only as the parser asks for them. The first record
+        # comes out once the variant table closes its VAS block, or after the
+        # last page, so a section running onto the next page is never cut short.
+        records = _iter_line_item_records(iter_page_text(pdf, stats, regions=True))
+        start = time.perf_counter()
+        other_stages = stats.total if stats is not None else 0.0
+        try:
+            return _first_record(records)
+        finally:
+            records.close()
+            if stats is not None:
+                # Page loading and layout happen inside the parser's loop and are timed on their own
+                stats.seconds["parse"] += time.perf_counter() - start - (stats.total - other_stages)
+
+def detect_seller(text):
+    """Determine the seller from the Company…Sourcing header text"""
+    company_to_sourcing = COMPANY_RE.search(text)
+    company_text = company_to_sourcing.group(0).lower() if company_to_sourcing else ""
+
+    if 'arka' in company_text:
+        return "Arka Global"
+    elif 'akhtar' in company_text:
+        return "Akhtar Textile Industries Pvt Ltd"
+    return None
+
+def parse_header_text(text):
+    """Parse the fields shared by all line items out of the PO header text"""
+    header = dict.fromkeys(HEADER_FIELDS)
+    for key, pattern in HEADER_PATTERNS.items():
+        match = pattern.search(text)
         if match:
-            fields[key] = match.group(1).strip()
+            header[key] = match.group(1).strip()
+    header["Seller"] = detect_seller(text)
+    return header
+
+def _parse_item_row(line):
+    """Parse the first line of an Item Details row, or return None for any other line"""
+    tokens = line.split()
+    if len(tokens) < 6 or not ITEM_NUMBER_RE.fullmatch(tokens[0]):
+        return None
+    hod_index = next((i for i, token in enumerate(tokens) if DATE_RE.fullmatch(token)), None)
+    if hod_index is None or hod_index + 2 >= len(tokens):
+        return None
+
+    anchors = {"start": 0, "date": hod_index, "end": len(tokens)}
+    row = {key: tokens[anchors[anchor] + offset] for key, (anchor, offset) in ITEM_ROW_FIELDS.items()}
+    row["Description"] = " ".join(tokens[2:hod_index])
+    return row
+
+def _line_item_record(header, row, row_line, continuation, vas_tokens):
+    """Combine header, item row and its continuation/VAS lines into one record"""
+    record = {"Line Item": row["Line Item"]}
+    record.update(dict.fromkeys(FIELD_NAMES))
+    record.update(header)
+    record.update(row)
+
+    # The description wraps onto the next line, in front of the delivery address
+    if continuation:
+        description_2, number = parse_address_text(continuation[0].strip())
+        record["Description"] = f"{row['Description']} {description_2}".strip()
+    last_line = continuation[-1] if continuation else row_line
+    record["Country"] = last_line.split()[-1].split(",")[-1].strip()
+    record["VAS"] = None if vas_tokens is None else " ".join(vas_tokens)
+    return record
+
+def _iter_line_item_records(page_texts):
+    """Parse page texts in a single line-by-line pass, yielding one record per line item.
+
+    Lines are dispatched by section (page header, item table, VAS block,
+    variant table). A section that runs past a page break is resumed once the
+    repeated page header has ended. Items are held only until their VAS block
+    has been read.
+    """
+    header_lines = []
+    header = dict.fromkeys(HEADER_FIELDS)
+    header_done = False
+    section = None  # last table section entered, resumed after a page header
+    items = []      # [row, row line, continuation lines] not yet yielded
+    vas = {}        # line item -> VAS tokens
+    vas_item = None
+
+    for page_text in page_texts:
+        state = "page_header"
+        for line in page_text.split("\n"):
+            if line.startswith(PAGE_FOOTER):
+                state = "footer"
+            elif state == "footer":
+                # Text joined across pages: the next page starts after the footer
+                if line.startswith(PAGE_HEADER_START):
+                    state = "page_header"
+                continue
+            elif ITEM_TABLE_MARKER in line:
+                if not header_done:
+                    header = parse_header_text("\n".join(header_lines))
+                    header_lines = None
+                    header_done = True
+                state = section = "items"
+            elif line.startswith(VAS_MARKER):
+                state = section = "vas"
+            elif line.startswith(VARIANT_TABLE_MARKER):
+                # Variant table: every item above has its VAS by now
+                state = section = "variants"
+                for row, row_line, continuation in items:
+                    yield _line_item_record(header, row, row_line, continuation, vas.get(row["Line Item"]))
+                items = []
+                vas = {}
+            elif state == "page_header":
+                if not header_done:
+                    header_lines.append(line)
+                elif section is not None and line.startswith(PAGE_HEADER_END):
+                    state = section
+                elif section == "items":
+                    # Item table continues on a page without the usual header
+                    row = _parse_item_row(line)
+                    if row is not None:
+                        state = "items"
+                        items.append([row, line, []])
+            elif state == "items":
+                row = _parse_item_row(line)
+                if row is not None:
+                    items.append([row, line, []])
+                elif items:
+                    items[-1][2].append(line)
+            elif state == "vas":
+                tokens = line.split()
+                if tokens and ITEM_NUMBER_RE.fullmatch(tokens[0]):
+                    vas_item = tokens[0]
+                    vas[vas_item] = tokens[1:]
+                elif vas_item is not None and vas_item in vas:
+                    vas[vas_item].extend(tokens)
+
+    for row, row_line, continuation in items:
+        yield _line_item_record(header, row, row_line, continuation, vas.get(row["Line Item"]))
+
+def _first_record(records):
+    """PO fields of the first line item record, without its "Line Item" key"""
+    for record in records:
+        del record["Line Item"]
+        return record
+    raise IndexError("no Item Details row found in PO text")
+
+def parse_po_text(text):
+    """Parse the PO fields of the first line item out of the extracted PDF text"""
+    return _first_record(_iter_line_item_records([text]))
+
+def iter_po_line_items(pdf_path):
+    """Yield one record per PO line item, reading the PDF a page at a time.
+
+    Each record is the PO header fields plus "Line Item" and that item's own
+    fields, in FIELD_NAMES order. The full document text is never built: only
+    the current page and the items waiting for their VAS block are held.
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        yield from _iter_line_item_records(iter_page_text(pdf))
+
+def open_cache(directory=DEFAULT_CACHE_DIR, **limits):
+    """Open the result cache for the current extractor version"""
+    return ResultCache(directory, EXTRACTOR_VERSION, **limits)
+
+def extract_po_data_cached(pdf_path, cache=None, regions=False):
+    """extract_po_data, reusing a previous result for a PDF with identical content"""
+    if cache is None:
+        return extract_po_data(pdf_path, regions)
+    key = cache.key_for(pdf_path, "regions" if regions else "")
+    data = cache.get(key)
+    if data is None:
+        data = extract_po_data(pdf_path, regions)
+        cache.put(key, data)
+    return data
+
+def _extract_one(pdf_path, cache=None, regions=False, line_items=False):
+    """Extract a single PDF, returning (path, data, error) instead of raising"""
+    try:
+        if line_items:
+            return pdf_path, list(iter_po_line_items(pdf_path)), None
+        return pdf_path, extract_po_data_cached(pdf_path, cache, regions), None
+    except Exception as e:
+        return pdf_path, None, f"{type(e).__name__}: {e}"
+
+def extract_po_batch(pdf_paths, workers=None, ordered=True, cache=None, regions=False, line_items=False,
+                     cancel=None):
+    """Extract many PDFs over a process pool, yielding (path, data, error) tuples.
+
+    With ordered=True results come back in input order, otherwise as soon as
+    each file finishes. workers defaults to the CPU count; workers=1 runs
+    in-process without a pool. An optional ResultCache is shared by all workers
+    and regions is passed on to extract_po_data. With line_items=True data is
+    the list of iter_po_line_items records of the file instead.
+
+    cancel is an optional threading.Event: once it is set the batch stops
+    within CANCEL_CHECK_INTERVAL, even while waiting on a slow file, and
+    files not started yet are skipped.
+    """
+    pdf_paths = list(pdf_paths)
+    if not pdf_paths:
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(pdf_paths)))
+    extract_one = partial(_extract_one, cache=cache, regions=regions, line_items=line_items)
+
+    if workers == 1:
+        for pdf_path in pdf_paths:
+            if cancel is not None and cancel.is_set():
+                return
+            yield extract_one(pdf_path)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for result in _iter_pool_results(executor, extract_one, pdf_paths, workers, ordered, cancel):
+            # Workers count puts on their own copy of the cache, so count them here
+            if cache is not None and result[2] is None:
+                cache.note_put()
+            yield result
+    finally:
+        # Closing the generator early (a cancelled batch) skips files not started yet
+        executor.shutdown(wait=True, cancel_futures=True)
+        if cache is not None:
+            cache.evict()
+
+def _iter_pool_results(executor, extract_one, pdf_paths, workers, ordered, cancel):
+    """Yield extract_one results from a process pool, see extract_po_batch"""
+    if ordered and cancel is None:
+        # Small chunks keep workers busy without holding results back too long
+        chunksize = max(1, len(pdf_paths) // (workers * 4))
+        yield from executor.map(extract_one, pdf_paths, chunksize=chunksize)
+        return
+    futures = [executor.submit(extract_one, pdf_path) for pdf_path in pdf_paths]
+    if cancel is None:
+        for future in as_completed(futures):
+            yield future.result()
+        return
+    pending = set(futures)
+    next_index = 0  # next future to yield in ordered mode
+    while pending:
+        done, pending = wait(pending, timeout=CANCEL_CHECK_INTERVAL, return_when=FIRST_COMPLETED)
+        if cancel.is_set():
+            return
+        if ordered:
+            while next_index < len(futures) and futures[next_index].done():
+                yield futures[next_index].result()
+                next_index += 1
+        else:
+            for future in done:
+                yield future.result()
+
+def expand_pdf_paths(paths):
+    """Expand directories to the PDF files they contain, keeping files as given"""
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.lower().endswith(".pdf")
+            )
+        else:
+            expanded.append(path)
+    return expanded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract purchase order data from PDF files")
+    parser.add_argument("paths", nargs="*", default=["azSXYx.pdf"],
+                        help="PDF files or directories of PDF files")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="print results as files finish instead of in input order")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"result cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-parse PDFs instead of using cached results")
+    parser.add_argument("--regions", action="store_true",
+                        help="lay out only the PO field regions and stop once all fields are found")
+    parser.add_argument("--line-items", action="store_true",
+                        help="report one record per PO line item instead of one per file")
+    parser.add_argument("-o", "--output",
+                        help="write results to a .csv, .jsonl or .xlsx file instead of printing them")
+    parser.add_argument("--append", action="store_true",
+                        help="append to an existing CSV/JSONL output file")
+    args = parser.parse_args(argv)
 
-    fields["VAS"] = " ".join(fields["VAS"].split()[1:])
-    fields["Seller"] = seller
-    fields["Country"] = country
-    fields["Unit Price"] = UnitPrice
-    fields["PO Qty"] = Qty
+    writer = None
+    if args.output:
+        from export import ResultWriter, result_columns
+        try:
+            writer = ResultWriter(args.output, columns=result_columns(args.line_items), append=args.append)
+        except (ValueError, RuntimeError) as e:
+            parser.error(str(e))
 
-    return fields
+    cache = None if args.no_cache else open_cache(args.cache_dir)
+    failed = 0
+    try:
+        for pdf_path, data, error in extract_po_batch(
+                expand_pdf_paths(args.paths), workers=args.workers, ordered=not args.unordered,
+                cache=cache, regions=args.regions, line_items=args.line_items):
+            if error:
+                failed += 1
+                print(f"Error processing {pdf_path}: {error}", file=sys.stderr)
+                continue
+            records = data if args.line_items else [data]
+            if writer is not None:
+                for record in records:
+                    writer.write(record, pdf_path)
+                continue
+            print(f"== {pdf_path}")
+            for record in records:
+                for key, value in record.items():
+                    print(f"{key}: {value}")
+    finally:
+        if writer is not None:
+            writer.close()
+            print(f"Wrote {writer.rows} rows to {args.output}")
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    pdf_path = "azSXYx.pdf"  # Replace with your PDF path
-    data = extract_po_data(pdf_path)
-    for key, value in data.items():
-        print(f"{key}: {value}")
+    sys.exit(main())
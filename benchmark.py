@@ -0,0 +1,199 @@
+import argparse
+import math
+import sys
+import time
+import timeit
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+import pdfplumber
+
+from automation import (ExtractionStats, extract_po_batch, extract_po_data, extract_text, iter_page_text,
+                        parse_po_text)
+
+SAMPLE_PDFS = ["azSXYx.pdf", "FyNDlJ.pdf", "NDFNZF.pdf", "RazFVT.pdf"]
+
+
+def _text_double_pass(pdf):
+    """The original text acquisition: extract_text runs twice per page"""
+    return "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
+
+def _text_single_pass(pdf):
+    return "\n".join(iter_page_text(pdf))
+
+def time_page_text(pdf_path, text_func, repeat):
+    """Return (best seconds per page, page count) for one text acquisition strategy"""
+    best = None
+    pages = 0
+    for _ in range(repeat):
+        # Reopen each round so no layout cache carries over between runs
+        with pdfplumber.open(pdf_path) as pdf:
+            pages = len(pdf.pages)
+            start = time.perf_counter()
+            text_func(pdf)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / max(pages, 1), pages
+
+def page_text_memory(pdf_path, text_func):
+    """Return (KiB still held after extraction, peak KiB) while the PDF stays open"""
+    with pdfplumber.open(pdf_path) as pdf:
+        tracemalloc.start()
+        try:
+            text_func(pdf)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return current // 1024, peak // 1024
+
+def bench_page_text(pdf_paths, repeat=5):
+    """Compare the double-pass and single-pass text stages per page"""
+    print(f"{'file':<14}{'pages':>6}{'ms/page before':>16}{'ms/page after':>15}"
+          f"{'held KiB before':>17}{'held KiB after':>16}{'peak KiB before':>17}{'peak KiB after':>16}")
+    for pdf_path in pdf_paths:
+        before, pages = time_page_text(pdf_path, _text_double_pass, repeat)
+        after, _ = time_page_text(pdf_path, _text_single_pass, repeat)
+        held_before, peak_before = page_text_memory(pdf_path, _text_double_pass)
+        held_after, peak_after = page_text_memory(pdf_path, _text_single_pass)
+        print(f"{pdf_path:<14}{pages:>6}{before * 1000:>16.1f}{after * 1000:>15.1f}"
+              f"{held_before:>17}{held_after:>16}{peak_before:>17}{peak_after:>16}")
+
+def time_extract(pdf_path, regions, repeat):
+    """Return best seconds per document for extract_po_data, or None if the PDF does not parse"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            extract_po_data(pdf_path, regions=regions)
+        except Exception:
+            return None
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_regions(pdf_paths, repeat=5):
+    """Compare full-page and region-limited extraction per document"""
+    print(f"{'file':<14}{'full ms/doc':>13}{'regions ms/doc':>16}")
+    for pdf_path in pdf_paths:
+        full = time_extract(pdf_path, False, repeat)
+        if full is None:
+            print(f"{pdf_path:<14}{'not a supported PO layout':>29}")
+            continue
+        regions = time_extract(pdf_path, True, repeat)
+        print(f"{pdf_path:<14}{full * 1000:>13.1f}{regions * 1000:>16.1f}")
+
+def bench_parse(pdf_paths, number=1000):
+    """Time field parsing alone, on text extracted once per file"""
+    print(f"{'file':<14}{'parse us/doc':>14}")
+    for pdf_path in pdf_paths:
+        text = extract_text(pdf_path)
+        try:
+            parse_po_text(text)
+        except Exception:
+            print(f"{pdf_path:<14}{'not a supported PO layout':>29}")
+            continue
+        best = min(timeit.repeat(lambda: parse_po_text(text), number=number, repeat=5))
+        print(f"{pdf_path:<14}{best / number * 1e6:>14.1f}")
+
+def peak_rss_kib(children=False):
+    """Peak resident set size in KiB, or None where the platform does not report it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+def _format_rss(kib):
+    return "n/a" if kib is None else f"{kib / 1024:.1f} MiB"
+
+def bench_throughput(pdf_paths, replicate=10, regions=False, workers=1):
+    """Process every PDF replicate times and report docs/sec, latency, stage times and peak RSS.
+
+    PDFs that do not parse are left out up front, and any later failure is
+    kept out of the latency and throughput figures, so they describe
+    successful extractions only. With workers > 1 the documents go through
+    extract_po_batch, so only throughput and the workers' peak RSS are reported.
+    """
+    supported = []
+    for pdf_path in pdf_paths:
+        try:
+            extract_po_data(pdf_path, regions=regions)
+        except Exception as e:
+            print(f"skipping {pdf_path}: {type(e).__name__}: {e}")
+        else:
+            supported.append(pdf_path)
+    if not supported:
+        print("no PDF could be parsed, nothing to benchmark")
+        return
+
+    docs = supported * replicate
+    mode = "regions" if regions else "full page"
+    print(f"{len(docs)} documents ({len(supported)} files x {replicate}), {mode}, {workers} worker(s)")
+
+    if workers > 1:
+        succeeded = 0
+        start = time.perf_counter()
+        for _, _, error in extract_po_batch(docs, workers=workers, ordered=False, regions=regions):
+            succeeded += error is None
+        elapsed = time.perf_counter() - start
+        print(f"  throughput   {succeeded / elapsed:.1f} docs/sec ({len(docs) - succeeded} failed)")
+        print(f"  peak RSS     {_format_rss(peak_rss_kib(children=True))} per worker")
+        return
+
+    stats = ExtractionStats()
+    latencies = []
+    failed = 0
+    for pdf_path in docs:
+        doc_stats = ExtractionStats()
+        doc_start = time.perf_counter()
+        try:
+            extract_po_data(pdf_path, regions=regions, stats=doc_stats)
+        except Exception:
+            failed += 1
+            continue
+        latencies.append(time.perf_counter() - doc_start)
+        stats.merge(doc_stats)
+    if not latencies:
+        print(f"  all {failed} documents failed")
+        return
+
+    print(f"  throughput   {len(latencies) / sum(latencies):.1f} docs/sec ({failed} failed)")
+    print(f"  latency      p50 {percentile(latencies, 50) * 1000:.1f} ms, p95 {percentile(latencies, 95) * 1000:.1f} ms")
+    print(f"  peak RSS     {_format_rss(peak_rss_kib())}")
+    print(f"  {'stage':<10}{'ms/doc':>10}{'share':>8}")
+    for name, seconds in stats.seconds.items():
+        print(f"  {name:<10}{seconds / len(latencies) * 1000:>10.2f}{seconds / stats.total:>8.1%}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the PO extractor")
+    parser.add_argument("paths", nargs="*", default=SAMPLE_PDFS, help="PDF files to benchmark")
+    parser.add_argument("--suite", choices=("all", "throughput", "compare"), default="all",
+                        help="throughput run, per-stage comparisons, or both (default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="runs per file in comparisons (best is reported)")
+    parser.add_argument("-n", "--replicate", type=int, default=10,
+                        help="times each file is processed in the throughput run (default: 10)")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes for the throughput run")
+    parser.add_argument("--regions", action="store_true", help="use region-limited extraction in the throughput run")
+    args = parser.parse_args(argv)
+
+    if args.suite in ("all", "throughput"):
+        bench_throughput(args.paths, replicate=args.replicate, regions=args.regions, workers=args.workers)
+    if args.suite in ("all", "compare"):
+        if args.suite == "all":
+            print()
+        bench_page_text(args.paths, repeat=args.repeat)
+        print()
+        bench_regions(args.paths, repeat=args.repeat)
+        print()
+        bench_parse(args.paths)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import csv
+import json
+import os
+
+try:
+    import openpyxl
+except ImportError:  # XLSX export is optional
+    openpyxl = None
+
+from automation import FIELD_NAMES
+
+FORMATS = ("csv", "jsonl", "xlsx")
+
+
+def result_columns(line_items=False):
+    """Fixed export column order: source file, optional line item, then the PO fields"""
+    return ["File"] + (["Line Item"] if line_items else []) + FIELD_NAMES
+
+def format_for_path(path):
+    """Guess the export format from a file extension"""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext == "json":
+        ext = "jsonl"
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported export format '{ext}', use one of: {', '.join(FORMATS)}")
+    return ext
+
+
+class ResultWriter:
+    """Stream extracted records to a CSV, JSONL or XLSX file as they are produced.
+
+    Each record is written (and flushed, for CSV/JSONL) as soon as write() is
+    called, so memory does not grow with the batch size. With append=True
+    CSV/JSONL rows are added to an existing file without repeating the header.
+    """
+
+    def __init__(self, path, fmt=None, columns=None, append=False):
+        self.path = path
+        self.fmt = fmt or format_for_path(path)
+        self.columns = columns or result_columns()
+        self.rows = 0
+        self._file = None
+        self._workbook = None
+
+        if self.fmt == "xlsx":
+            if openpyxl is None:
+                raise RuntimeError("XLSX export needs openpyxl, install it with 'pip install openpyxl'")
+            if append:
+                raise ValueError("XLSX files cannot be appended to, export to CSV or JSONL instead")
+            # Write-only workbooks stream rows to disk instead of keeping cells in memory
+            self._workbook = openpyxl.Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet("Purchase Orders")
+            self._sheet.append(self.columns)
+        elif self.fmt == "csv":
+            has_rows = append and os.path.exists(path) and os.path.getsize(path) > 0
+            if has_rows:
+                with open(path, newline="", encoding="utf-8-sig") as f:
+                    existing = next(csv.reader(f), [])
+                if existing != self.columns:
+                    raise ValueError(f"Cannot append to {path}: its columns differ from this export")
+            # A BOM at the start of new files lets Excel detect UTF-8
+            encoding = "utf-8" if has_rows else "utf-8-sig"
+            self._file = open(path, "a" if append else "w", newline="", encoding=encoding)
+            self._csv = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+            if not has_rows:
+                self._csv.writeheader()
+        elif self.fmt == "jsonl":
+            self._file = open(path, "a" if append else "w", encoding="utf-8")
+        else:
+            raise ValueError(f"Unsupported export format '{self.fmt}', use one of: {', '.join(FORMATS)}")
+
+    def write(self, record, pdf_path=None):
+        """Write one record; pdf_path fills the File column"""
+        row = {"File": pdf_path}
+        row.update(record)
+        if self.fmt == "csv":
+            self._csv.writerow(row)
+            self._file.flush()
+        elif self.fmt == "jsonl":
+            self._file.write(json.dumps({key: row.get(key) for key in self.columns}, ensure_ascii=False) + "\n")
+            self._file.flush()
+        else:
+            self._sheet.append([row.get(key) for key in self.columns])
+        self.rows += 1
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.save(self.path)
+            self._workbook = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,72 +1,207 @@
-try:
-    import tkinter
-    import customtkinter
-    from tkinter import messagebox, filedialog
-    from automation import extract_po_data
-    import requests
+import multiprocessing
+import queue
+import threading
+import tkinter
+from tkinter import messagebox, filedialog, ttk
 
+import customtkinter
+import requests
+
+from automation import extract_po_batch, open_cache
+from export import ResultWriter, result_columns
+
+ACTIVATION_URL = "https://saim2481.pythonanywhere.com/ATactivation-desktop-response/"
+ACTIVATION_TIMEOUT = 10  # seconds
+
+POLL_INTERVAL = 100  # ms between checks of the worker queue
+MAX_RESULTS_PER_POLL = 200  # keeps each poll short so the window stays responsive
+
+
+class ExtractionWorker(threading.Thread):
+    """Run a batch extraction off the Tk thread, posting results to a queue"""
+
+    def __init__(self, pdf_files, messages, cache=None):
+        super().__init__(daemon=True)
+        self.pdf_files = pdf_files
+        self.messages = messages
+        self.cache = cache
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        # The batch checks the cancel event while waiting, so a cancel does not wait for the next result
+        batch = extract_po_batch(self.pdf_files, ordered=False, cache=self.cache, cancel=self.cancelled)
+        try:
+            for result in batch:
+                if self.cancelled.is_set():
+                    break
+                self.messages.put(("result", result))
+        except Exception as e:
+            self.messages.put(("failed", str(e)))
+        finally:
+            batch.close()
+        self.messages.put(("done", self.cancelled.is_set()))
+
+
+class ResultsWindow(customtkinter.CTkToplevel):
+    """Progress, cancel and a single table of results for one extraction batch"""
+
+    def __init__(self, pdf_files, cache=None):
+        super().__init__()
+        self.title('Extracted Data')
+        self.geometry("900x600")
+
+        self.total = len(pdf_files)
+        self.processed = 0
+        self.failed = 0
+        self.records = []  # (pdf file, data) in the order they finished
+        self.columns = ["Status"] + result_columns()
+
+        self.status_label = customtkinter.CTkLabel(self, text=f"Processing 0 of {self.total} files...")
+        self.status_label.pack(pady=(10, 5), padx=10, anchor="w")
+
+        self.progress = customtkinter.CTkProgressBar(self)
+        self.progress.set(0)
+        self.progress.pack(fill="x", padx=10)
+
+        buttons = customtkinter.CTkFrame(self, fg_color="transparent")
+        buttons.pack(fill="x", padx=10, pady=8)
+        self.cancel_button = customtkinter.CTkButton(buttons, text="Cancel", command=self.cancel, width=120)
+        self.cancel_button.pack(side="left")
+        self.export_button = customtkinter.CTkButton(
+            buttons, text="Export Results", command=self.export, width=120, state=customtkinter.DISABLED
+        )
+        self.export_button.pack(side="left", padx=8)
+
+        # A Treeview only draws the rows in view, so large batches stay cheap to render
+        table = customtkinter.CTkFrame(self)
+        table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.tree = ttk.Treeview(table, columns=self.columns, show="headings")
+        for column in self.columns:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=240 if column in ("File", "Description", "VAS") else 110, stretch=False)
+        self.tree.tag_configure("error", foreground="red")
+        y_scroll = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        x_scroll = ttk.Scrollbar(table, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        table.grid_rowconfigure(0, weight=1)
+        table.grid_columnconfigure(0, weight=1)
+
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.messages = queue.Queue()
+        self.worker = ExtractionWorker(pdf_files, self.messages, cache)
+        self.worker.start()
+        self.poll_id = self.after(POLL_INTERVAL, self.poll)
+
+    def poll(self):
+        """Move finished results from the worker queue into the table"""
+        try:
+            for _ in range(MAX_RESULTS_PER_POLL):
+                kind, payload = self.messages.get_nowait()
+                if kind == "result":
+                    self.add_result(*payload)
+                elif kind == "failed":
+                    messagebox.showerror("Processing Error", f"An error occurred:\n{payload}", parent=self)
+                else:
+                    self.poll_id = None
+                    self.finish(cancelled=payload)
+                    return
+        except queue.Empty:
+            pass
+        self.poll_id = self.after(POLL_INTERVAL, self.poll)
+
+    def add_result(self, pdf_file, data, error):
+        self.processed += 1
+        if error:
+            self.failed += 1
+            self.tree.insert("", "end", values=[f"Error: {error}", pdf_file], tags=("error",))
+        else:
+            self.records.append((pdf_file, data))
+            row = {"Status": "OK", "File": pdf_file}
+            row.update(data)
+            self.tree.insert("", "end", values=["" if row.get(key) is None else row[key] for key in self.columns])
+
+        self.progress.set(self.processed / self.total)
+        self.status_label.configure(text=f"Processing {self.processed} of {self.total} files...")
+
+    def finish(self, cancelled):
+        state = "Cancelled" if cancelled else "Done"
+        self.status_label.configure(
+            text=f"{state}: {self.processed} of {self.total} files processed, {self.failed} failed"
+        )
+        self.cancel_button.configure(state=customtkinter.DISABLED)
+        if self.records:
+            self.export_button.configure(state=customtkinter.NORMAL)
+
+    def cancel(self):
+        self.worker.cancel()
+        self.cancel_button.configure(state=customtkinter.DISABLED)
+        self.status_label.configure(text="Cancelling, waiting for files already being read to finish...")
+
+    def close(self):
+        self.worker.cancel()
+        if self.poll_id is not None:
+            self.after_cancel(self.poll_id)
+            self.poll_id = None
+        self.destroy()
+
+    def export(self):
+        output_path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("JSON Lines files", "*.jsonl")]
+        )
+        if not output_path:
+            return
+
+        try:
+            with ResultWriter(output_path) as writer:
+                for pdf_file, data in self.records:
+                    writer.write(data, pdf_file)
+        except Exception as e:
+            messagebox.showerror("Export Error", f"An error occurred:\n{str(e)}", parent=self)
+            return
+        messagebox.showinfo("Export Complete", f"Exported {writer.rows} purchase orders to\n{output_path}", parent=self)
+
+
+def check_activation(results):
+    """Ask the activation server whether processing is allowed, posting the outcome to results"""
+    try:
+        response = requests.get(ACTIVATION_URL, timeout=ACTIVATION_TIMEOUT)
+        response.raise_for_status()
+        results.put(("ok", response.text))
+    except requests.exceptions.RequestException:
+        results.put(("connection_error", False))
+    except Exception:
+        results.put(("error", False))
+
+
+def main():
     # Keep the same theme and appearance
     customtkinter.set_appearance_mode("light")
     customtkinter.set_default_color_theme('blue')
 
+    # Re-selected or re-dropped POs are served from the on-disk result cache
+    try:
+        result_cache = open_cache()
+    except OSError:
+        result_cache = None
+
     def start_processing():
-        pdf_files = entry_pdf.get()
+        pdf_files = [pdf_file.strip() for pdf_file in entry_pdf.get().split(";") if pdf_file.strip()]
 
-        if pdf_files == '':
+        if not pdf_files:
             messagebox.showerror('Error', 'Please select one or more PDF files')
             return
 
-        pdf_files = pdf_files.split(";")  # split multiple file paths
-
         try:
-            # Create result window
-            result_window = customtkinter.CTkToplevel()
-            result_window.title('Extracted Data')
-            result_window.geometry("500x600")
-
-            # Scrollable frame
-            scroll_frame = customtkinter.CTkScrollableFrame(result_window, width=480, height=580)
-            scroll_frame.pack(pady=10, padx=10)
-
-            for pdf_file in pdf_files:
-                pdf_file = pdf_file.strip()
-                if not pdf_file:
-                    continue
-
-                try:
-                    data = extract_po_data(pdf_file)
-
-                    # File title
-                    file_label = customtkinter.CTkLabel(
-                        scroll_frame,
-                        text=f"📄 {pdf_file}",
-                        font=('Helvetica', 14, 'bold'),
-                        wraplength=460
-                    )
-                    file_label.pack(pady=(10, 5), anchor="w")
-
-                    # Fields inside this file
-                    for key, value in data.items():
-                        label = customtkinter.CTkLabel(
-                            scroll_frame,
-                            text=f"{key}: {value}",
-                            wraplength=460
-                        )
-                        label.pack(pady=2, anchor="w")
-
-                    # Separator
-                    separator = customtkinter.CTkLabel(scroll_frame, text="-" * 80)
-                    separator.pack(pady=8, anchor="w")
-
-                except Exception as e:
-                    error_label = customtkinter.CTkLabel(
-                        scroll_frame,
-                        text=f"Error processing {pdf_file}: {str(e)}",
-                        text_color="red",
-                        wraplength=460
-                    )
-                    error_label.pack(pady=5, anchor="w")
-
+            ResultsWindow(pdf_files, result_cache)
         except Exception as e:
             messagebox.showerror("Processing Error", f"An error occurred:\n{str(e)}")
 
@@ -107,7 +242,7 @@ try:
     )
     browse_pdf_button.place(relx=0.82, rely=0.2, anchor=tkinter.N)
 
-    # Execute Button
+    # Execute Button, enabled once the activation check succeeds
     execute_button = customtkinter.CTkButton(
         master=root,
         text="Process PDFs",
@@ -115,30 +250,44 @@ try:
         width=430,
         height=25,
         border_width=0,
-        corner_radius=8
+        corner_radius=8,
+        state=customtkinter.DISABLED
     )
     execute_button.place(relx=0.51, rely=0.33, anchor=tkinter.N)
 
     root.geometry("500x600")
 
     # --- Connection Check ---
-    try:
-        cond_AT = requests.get("https://saim2481.pythonanywhere.com/ATactivation-desktop-response/")
-        cond_AT.raise_for_status()
-        cond_AT = cond_AT.text
-    except requests.exceptions.RequestException:
-        cond_AT = False
-        messagebox.showerror("Connection Error", "Please Check your internet Connection")
-    except:
-        cond_AT = False
-        messagebox.showerror("Something Went Wrong", "Unexpected Error")
+    # Runs in the background so a slow network does not hold up the window
+    activation = queue.Queue()
+    threading.Thread(target=check_activation, args=(activation,), daemon=True).start()
 
-    print(cond_AT)
-    if cond_AT != "true":
-        execute_button.configure(state=customtkinter.DISABLED)
+    def poll_activation():
+        try:
+            status, cond_AT = activation.get_nowait()
+        except queue.Empty:
+            root.after(POLL_INTERVAL, poll_activation)
+            return
+
+        if status == "connection_error":
+            messagebox.showerror("Connection Error", "Please Check your internet Connection")
+        elif status == "error":
+            messagebox.showerror("Something Went Wrong", "Unexpected Error")
+
+        print(cond_AT)
+        if cond_AT == "true":
+            execute_button.configure(state=customtkinter.NORMAL)
 
+    root.after(POLL_INTERVAL, poll_activation)
     root.mainloop()
-except Exception as e:
-    print(e)
-    while True:
-        pass
+
+
+if __name__ == "__main__":
+    # Needed for the process pool in the frozen Windows build
+    multiprocessing.freeze_support()
+    try:
+        main()
+    except Exception as e:
+        print(e)
+        while True:
+            pass
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of extracted PO fields keyed by PDF content hash and extractor version.
+
+    Each entry is a small JSON file. An entry's modification time is its last
+    use, so eviction drops entries older than max_age seconds first and then
+    the least recently used ones until the cache fits max_entries/max_bytes.
+    Eviction scans the whole directory, so it only runs every evict_every
+    puts; between runs the cache may overshoot its limits by that many entries.
+    Worker processes get their own copy of the cache and its put count, so a
+    process pool should report its workers' results with note_put and
+    call evict once it is done.
+    """
+
+    def __init__(self, directory, version, max_entries=5000, max_bytes=50 * 1024 * 1024, max_age=30 * 24 * 3600,
+                 evict_every=100):
+        self.directory = directory
+        self.version = str(version)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.evict_every = evict_every
+        self._puts = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key_for(self, pdf_path, variant=""):
+        """Key for a PDF's content; variant separates results of different extraction modes"""
+        key = f"{file_digest(pdf_path)}-v{self.version}"
+        return f"{key}-{variant}" if variant else key
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        """Return the cached fields for key, or None on a miss or expired entry"""
+        path = self._entry_path(key)
+        try:
+            if self.max_age is not None and time.time() - os.path.getmtime(path) > self.max_age:
+                self._remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        return data
+
+    def put(self, key, data):
+        # Write to a temp file and rename so readers in other processes never see half an entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            self._remove(tmp_path)
+            raise
+        self.note_put()
+
+    def note_put(self):
+        """Count one put, made here or by a worker process, evicting every evict_every of them"""
+        self._puts += 1
+        if self._puts >= self.evict_every:
+            self._puts = 0
+            self.evict()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until within size limits"""
+        entries = []
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                self._remove(entry.path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            over_count = self.max_entries is not None and count > self.max_entries
+            over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+            if not (over_count or over_bytes):
+                break
+            self._remove(path)
+            count -= 1
+            total_bytes -= size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith((".json", ".tmp")):
+                self._remove(entry.path)
@@ -0,0 +1,209 @@
+import os
+from contextlib import nullcontext
+
+import pytest
+
+import automation
+from automation import (FIELD_NAMES, _iter_line_item_records, extract_po_data, iter_po_line_items,
+                        parse_po_text)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Output of the original split-based parser on the bundled samples
+EXPECTED = {
+    "azSXYx.pdf": {
+        "PO Number": "2100174370",
+        "Style Number": "A0086-0069",
+        "Description": "311 SHAPING SKN CAPRI 22 CAMP DENIM",
+        "PO Rel Date": "28.08.2025",
+        "Unit Price": "6.29",
+        "PO Qty": "6.538",
+        "HOD Date": "14.11.2025",
+        "FFC Code": "AL547",
+        "Seller": "Akhtar Textile Industries Pvt Ltd",
+        "Sourcing Type": "Regular PO",
+        "PO Header Text": "",
+        "Country": "USA",
+        "VAS": "BOM - As per BOM K7I - SZ STKR FRT LFT PNL P6E - BCK/BCK TRIFOLD VRG - S20RFID-1 UVM STKR",
+        "Plant Code": "2025",
+        "Season": "261",
+        "Brand": "LEVIS",
+    },
+    "RazFVT.pdf": {
+        "PO Number": "2100165465",
+        "Style Number": "18881-0791",
+        "Description": "711 SKINNY EVERYONE'S A WINNER CLUB CO.(CANADA) INC",
+        "PO Rel Date": "24.07.2025",
+        "Unit Price": "6.75",
+        "PO Qty": "960",
+        "HOD Date": "24.10.2025",
+        "FFC Code": "DAGGN",
+        "Seller": "Akhtar Textile Industries Pvt Ltd",
+        "Sourcing Type": "Regular PO",
+        "PO Header Text": "",
+        "Country": "Canada",
+        "VAS": "",
+        "Plant Code": "2012",
+        "Season": "261",
+        "Brand": "LEVIS",
+    },
+}
+
+PAGE_HEADER = """Purchase Order# 2100174370 Payment Terms
+(Days) NT90
+Brand LEVIS Season 261 Pur.Org 2000
+DocDate 28.08.2025 FFC Code AL547
+OA No. 4600002714 PO Rel Date 28.08.2025
+Vendor 403256 AKHTAR TEXTILE INDUSTRIES PVT LTD Commodity Code
+Purchase Order PO Value 41.124,02 PO Quantity 6538 Currency USD"""
+
+FIRST_PAGE = PAGE_HEADER + """
+Company 200 Manufacturer 403256 Seller 403256 Invoice To Branch Office PAKISTAN
+Levi Strauss & Co AKHTAR TEXTILE INDUSTRIES AKHTAR TEXTILE Levi Strauss & Co Source Region SAS
+Sourcing Type - Regular PO
+PO Header Text -
+Purchase Order Item Details
+Item# Generic Description Planned HOD Planned Plant Delivery Address PO Qty UOM PO Unit Item Total Value
+Material Delivery Date Price
+00010 A0086-0069 311 SHAPING SKN CAPRI 22 14.11.2025 10.01.2026 2025 Granite 6.538 EA 6.29 41.124,02
+CAMP DENIM 5235 Westpoint Dr
+Groveport,OH-43125,USA
+This Purchase Order is issued under, and is subject to, the Master Supply Agreement
+recorded in LS&CO's system shall be effective"""
+
+# Item table runs onto the next page without its column header, then the VAS block
+# starts and itself continues over a further page break
+SECOND_PAGE = PAGE_HEADER + """
+00020 B0001-0001 501 ORIGINAL 15.11.2025 10.01.2026 2030 Granite 100 EA 7.00 700,00
+STONE WASH 1 Main St
+Toronto,Canada
+Line Item VAS Line Item Text
+00010 BOM - As per BOM
+This Purchase Order is issued under, and is subject to, the Master Supply Agreement"""
+
+THIRD_PAGE = PAGE_HEADER + """
+K7I - SZ STKR FRT LFT PNL
+00020 P6E - BCK/BCK TRIFOLD
+Item# Variant Material Description Size PO Qty Transportation Inco IncoTerm Comp
+00011 A0086-006931 311 SHAPING SKN CAPRI 22 CAMP DENIM 31 1.035 Ocean FOB PKLHE"""
+
+
+def test_line_items_continue_across_page_breaks():
+    records = list(_iter_line_item_records([FIRST_PAGE, SECOND_PAGE, THIRD_PAGE]))
+
+    assert [record["Line Item"] for record in records] == ["00010", "00020"]
+    first, second = records
+    assert first["Description"] == "311 SHAPING SKN CAPRI 22 CAMP DENIM"
+    assert first["Country"] == "USA"
+    assert first["VAS"] == "BOM - As per BOM K7I - SZ STKR FRT LFT PNL"
+    assert second["Style Number"] == "B0001-0001"
+    assert second["Description"] == "501 ORIGINAL STONE WASH"
+    assert second["PO Qty"] == "100"
+    assert second["Unit Price"] == "7.00"
+    assert second["Plant Code"] == "2030"
+    assert second["Country"] == "Canada"
+    assert second["VAS"] == "P6E - BCK/BCK TRIFOLD"
+    assert second["PO Number"] == "2100174370"
+    assert second["Seller"] == "Akhtar Textile Industries Pvt Ltd"
+
+
+def test_line_items_from_pages_joined_into_one_text():
+    joined = "\n".join([FIRST_PAGE, SECOND_PAGE, THIRD_PAGE])
+    records = list(_iter_line_item_records([joined]))
+
+    assert [record["Line Item"] for record in records] == ["00010", "00020"]
+    assert records[1]["VAS"] == "P6E - BCK/BCK TRIFOLD"
+
+
+FOOTER = "This Purchase Order is issued under, and is subject to, the Master Supply Agreement"
+
+# First item's description and address wrap onto the next page
+WRAPPED_ITEM_PAGES = [
+    FIRST_PAGE.split("\nCAMP DENIM")[0] + "\n" + FOOTER,
+    PAGE_HEADER + """
+CAMP DENIM 5235 Westpoint Dr
+Groveport,OH-43125,USA
+Line Item VAS Line Item Text
+00010 BOM - As per BOM
+Item# Variant Material Description Size PO Qty Transportation Inco IncoTerm Comp""",
+]
+
+
+@pytest.mark.parametrize("pages", [[FIRST_PAGE, SECOND_PAGE, THIRD_PAGE], WRAPPED_ITEM_PAGES],
+                         ids=["vas-split", "item-split"])
+def test_regions_read_sections_split_across_pages(monkeypatch, pages):
+    read = []
+
+    def fake_page_text(pdf, stats=None, regions=False):
+        for text in pages + [PAGE_HEADER + "\nnever reached"]:
+            read.append(text)
+            yield text
+
+    monkeypatch.setattr(automation, "_open_pdf", lambda pdf_path, stats: nullcontext())
+    monkeypatch.setattr(automation, "iter_page_text", fake_page_text)
+
+    assert extract_po_data("split.pdf", regions=True) == parse_po_text("\n".join(pages))
+    assert read == pages  # stops at the variant table, not at the first page
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+@pytest.mark.parametrize("regions", [False, True])
+def test_extract_po_data_matches_samples(name, regions):
+    data = extract_po_data(os.path.join(HERE, name), regions=regions)
+
+    assert data == EXPECTED[name]
+    assert list(data) == FIELD_NAMES
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_iter_po_line_items_matches_samples(name):
+    records = list(iter_po_line_items(os.path.join(HERE, name)))
+
+    assert records == [dict({"Line Item": "00010"}, **EXPECTED[name])]
+
+
+@pytest.mark.parametrize("name", ["FyNDlJ.pdf", "NDFNZF.pdf"])
+def test_unsupported_layouts_raise(name):
+    with pytest.raises(IndexError):
+        extract_po_data(os.path.join(HERE, name))
+
+
+MULTI_ITEM_PAGE = FIRST_PAGE.split("\nThis Purchase Order")[0] + """
+00020 B0001-0001 501 ORIGINAL 15.11.2025 10.01.2026 2030 Granite 100 EA 7.00 700,00
+STONE WASH 1 Main St
+Toronto,Canada
+Line Item VAS Line Item Text
+00010 BOM - As per BOM
+K7I - SZ STKR FRT LFT PNL
+00020
+Item# Variant Material Description Size PO Qty Transportation Inco IncoTerm Comp"""
+
+
+def test_multi_item_records():
+    records = list(_iter_line_item_records([MULTI_ITEM_PAGE]))
+
+    assert [
+        (r["Line Item"], r["Style Number"], r["HOD Date"], r["Plant Code"], r["PO Qty"], r["Unit Price"],
+         r["Country"], r["VAS"])
+        for r in records
+    ] == [
+        ("00010", "A0086-0069", "14.11.2025", "2025", "6.538", "6.29", "USA", "BOM - As per BOM K7I - SZ STKR FRT LFT PNL"),
+        ("00020", "B0001-0001", "15.11.2025", "2030", "100", "7.00", "Canada", ""),
+    ]
+    assert all(list(r)[1:] == FIELD_NAMES for r in records)
+    assert all(r["Brand"] == "LEVIS" and r["FFC Code"] == "AL547" for r in records)
+
+
+def test_parse_po_text_reports_first_item():
+    data = parse_po_text(MULTI_ITEM_PAGE)
+
+    assert data["Style Number"] == "A0086-0069"
+    assert data["Description"] == "311 SHAPING SKN CAPRI 22 CAMP DENIM"
+    assert list(data) == FIELD_NAMES
+
+
+def test_item_without_vas_block_has_no_vas():
+    page = MULTI_ITEM_PAGE.replace("00020\nItem#", "Item#")
+    records = list(_iter_line_item_records([page]))
+
+    assert records[1]["VAS"] is None
@@ -0,0 +1,48 @@
+import os
+import shutil
+
+import pytest
+
+from automation import extract_po_batch
+from result_cache import ResultCache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_distinct_pdfs(directory, count):
+    """Copies of a sample PO whose content hashes all differ"""
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"po_{i}.pdf")
+        shutil.copyfile(os.path.join(HERE, "azSXYx.pdf"), path)
+        with open(path, "ab") as f:
+            f.write(f"\n% copy {i}\n".encode())
+        paths.append(path)
+    return paths
+
+
+def cache_entries(cache):
+    return [name for name in os.listdir(cache.directory) if name.endswith(".json")]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_batch_keeps_cache_within_limits(tmp_path, workers):
+    pdf_paths = make_distinct_pdfs(tmp_path, 12)
+    cache = ResultCache(tmp_path / "cache", "test", max_entries=2, evict_every=3)
+
+    results = list(extract_po_batch(pdf_paths, workers=workers, cache=cache))
+
+    assert [error for _, _, error in results] == [None] * 12
+    assert len(cache_entries(cache)) == 2
+
+
+def test_evict_drops_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path, "test", max_entries=2, evict_every=1000, max_age=None)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, {"n": i})
+        os.utime(cache._entry_path(key), (1000 + i, 1000 + i))
+    cache.get("a")  # marks "a" as recently used
+
+    cache.evict()
+
+    assert sorted(cache_entries(cache)) == ["a.json", "c.json"]
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from automation import DEFAULT_CACHE_DIR, extract_po_batch, open_cache
+from export import ResultWriter, result_columns
+from result_cache import file_digest
+
+STATE_FILE = "watcher_state.json"
+SAVE_EVERY = 20  # results between state file saves within a batch
+MAX_ATTEMPTS = 3  # tries for a file that fails before it waits for its content to change
+
+
+def _signature(path):
+    """Cheap change check for a file: (size, modification time)"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _should_retry(entry):
+    """Whether a recorded failure still has attempts left"""
+    return bool(entry.get("error")) and entry.get("attempts", 0) < MAX_ATTEMPTS
+
+
+class FolderWatcher:
+    """Poll a folder for new or changed PO PDFs and append their fields to an output file.
+
+    A file is picked up once its size and modification time have stayed the
+    same for one polling interval, so half-copied PDFs are not parsed. What
+    has been processed is kept in a state file in the output directory, so a
+    restart only processes files that are new or whose content changed. A
+    file that fails is retried on the next scans, up to MAX_ATTEMPTS times.
+    """
+
+    def __init__(self, watch_dir, output_dir="output", workers=2, interval=5.0, fmt="csv", cache=None):
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError("The watcher appends results, use the csv or jsonl format")
+        self.watch_dir = watch_dir
+        self.output_dir = output_dir
+        self.workers = workers
+        self.interval = interval
+        self.cache = cache
+        self.output_path = os.path.join(output_dir, f"purchase_orders.{fmt}")
+        self.state_path = os.path.join(output_dir, STATE_FILE)
+        self.unsettled = {}  # name -> signature on the previous scan
+        self._dirty = False  # state changed without a processed file
+        os.makedirs(output_dir, exist_ok=True)
+        self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            print(f"Ignoring unreadable state file {self.state_path}", file=sys.stderr)
+            return {}
+
+    def _save_state(self):
+        # Replace the file in one step so a crash never leaves it half written
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=1)
+        os.replace(tmp_path, self.state_path)
+
+    def scan(self, settle=True):
+        """Return the PDFs that are new or changed and have finished being written"""
+        ready = []
+        seen = set()
+        for name in sorted(os.listdir(self.watch_dir)):
+            path = os.path.join(self.watch_dir, name)
+            if not name.lower().endswith(".pdf") or not os.path.isfile(path):
+                continue
+            seen.add(name)
+            try:
+                signature = _signature(path)
+            except OSError:
+                continue  # removed between listdir and stat
+
+            entry = self.state.get(name)
+            if entry is not None and entry["signature"] == signature:
+                if _should_retry(entry):
+                    ready.append((name, signature, entry["digest"]))
+                continue
+            if settle and self.unsettled.get(name) != signature:
+                self.unsettled[name] = signature
+                continue
+            self.unsettled.pop(name, None)
+
+            try:
+                digest = file_digest(path)
+            except OSError as e:
+                print(f"Skipping {path} for now: {e}", file=sys.stderr)
+                continue
+            # Touched or re-copied without changing content: nothing to redo
+            if entry is not None and entry["digest"] == digest and not _should_retry(entry):
+                entry["signature"] = signature
+                self._dirty = True
+                continue
+            ready.append((name, signature, digest))
+
+        # Forget files that left the folder, so the state does not grow without bound
+        for name in list(self.unsettled):
+            if name not in seen:
+                del self.unsettled[name]
+        for name in list(self.state):
+            if name not in seen:
+                del self.state[name]
+                self._dirty = True
+        return ready
+
+    def process(self, ready):
+        """Extract the given PDFs with bounded concurrency, appending results as they finish"""
+        if not ready:
+            if self._dirty:
+                self._save_state()
+                self._dirty = False
+            return 0
+        by_path = {os.path.join(self.watch_dir, name): (name, signature, digest) for name, signature, digest in ready}
+        written = 0
+        unsaved = 0
+        try:
+            with ResultWriter(self.output_path, columns=result_columns(), append=True) as writer:
+                for pdf_path, data, error in extract_po_batch(
+                        list(by_path), workers=self.workers, ordered=False, cache=self.cache):
+                    name, signature, digest = by_path[pdf_path]
+                    attempts = 0
+                    if error:
+                        previous = self.state.get(name)
+                        if previous is not None and previous.get("error") and previous["digest"] == digest:
+                            attempts = previous.get("attempts", 0)
+                        attempts += 1
+                        retry = " (will retry)" if attempts < MAX_ATTEMPTS else ""
+                        print(f"Error processing {pdf_path}: {error}{retry}", file=sys.stderr)
+                    else:
+                        writer.write(data, pdf_path)
+                        written += 1
+                        print(f"Processed {pdf_path}")
+                    self.state[name] = {
+                        "signature": signature,
+                        "digest": digest,
+                        "processed_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "error": error,
+                        "attempts": attempts,
+                    }
+                    unsaved += 1
+                    if unsaved >= SAVE_EVERY:
+                        self._save_state()
+                        unsaved = 0
+        finally:
+            # Keep what finished even if the batch was interrupted
+            if unsaved or self._dirty:
+                self._save_state()
+            self._dirty = False
+        return written
+
+    def run_once(self, settle=False):
+        return self.process(self.scan(settle=settle))
+
+    def run(self):
+        print(f"Watching {self.watch_dir} every {self.interval:g}s, writing to {self.output_path}")
+        while True:
+            try:
+                self.run_once(settle=True)
+            except Exception as e:
+                # e.g. the share dropped or the results file is open in Excel
+                print(f"Watcher error: {type(e).__name__}: {e}, retrying in {self.interval:g}s", file=sys.stderr)
+            time.sleep(self.interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a folder and extract purchase order PDFs as they arrive")
+    parser.add_argument("watch_dir", help="folder that receives PO PDFs")
+    parser.add_argument("-o", "--output-dir", default="output",
+                        help="folder for the results file and watcher state (default: output)")
+    parser.add_argument("-j", "--workers", type=int, default=2,
+                        help="number of PDFs processed at the same time (default: 2)")
+    parser.add_argument("--interval", type=float, default=5.0,
+                        help="seconds between folder scans (default: 5)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="csv",
+                        help="results file format (default: csv)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"result cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-parse PDFs instead of using cached results")
+    parser.add_argument("--once", action="store_true",
+                        help="process what is in the folder now and exit")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.watch_dir):
+        parser.error(f"{args.watch_dir} is not a folder")
+
+    cache = None if args.no_cache else open_cache(args.cache_dir)
+    watcher = FolderWatcher(args.watch_dir, args.output_dir, workers=args.workers,
+                            interval=args.interval, fmt=args.format, cache=cache)
+    if args.once:
+        watcher.run_once()
+        return 0
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("Stopped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())